@@ -1,52 +1,123 @@
 from flask import Flask, jsonify
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
-from flask_bcrypt import Bcrypt
-from flask_restful import Api
+from importlib import import_module
+import click
 import os
 
-app = Flask(__name__)
+from extensions import db, api, jwt, bcrypt
+from replicas import init_replicas
 
-# Configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///fitforge.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'your-super-secret-key-change-in-production')
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
-app.config['JSON_SORT_KEYS'] = False
 
-# Initialize extensions
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
-api = Api(app)
-CORS(app)
-jwt = JWTManager(app)
-bcrypt = Bcrypt(app)
+class LazyCommand(click.Command):
+    """CLI command whose implementation is imported only when it is invoked.
 
-# Error handlers
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({'error': 'Resource not found'}), 404
+    Keeps Flask-Migrate/Alembic, NumPy and PyArrow out of serving workers.
+    """
 
-@app.errorhandler(500)
-def internal_error(error):
-    return jsonify({'error': 'Internal server error'}), 500
+    def __init__(self, name, loader, help=None):
+        super().__init__(name, help=help)
+        self.loader = loader
+        self._command = None
 
-@app.errorhandler(400)
-def bad_request(error):
-    return jsonify({'error': 'Bad request'}), 400
+    def load(self):
+        if self._command is None:
+            self._command = self.loader()
+        return self._command
 
-# Import models after db initialization
-from models import *
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self.load().make_context(info_name, args, parent=parent, **extra)
 
-# Import and register routes
-from routes import *
+    def invoke(self, ctx):
+        return self.load().invoke(ctx)
 
-# Health check endpoint
-@app.route('/health', methods=['GET'])
-def health_check():
-    return jsonify({'status': 'healthy', 'message': 'FitForge API is running'}), 200
+
+def _command(module, name):
+    return lambda: getattr(import_module(module), name)
+
+
+def _migrate_commands(app):
+    from flask_migrate import Migrate
+    from flask_migrate.cli import db as db_cli_group
+
+    Migrate(app, db)
+    return db_cli_group
+
+
+def register_commands(app):
+    app.cli.add_command(LazyCommand("db", lambda: _migrate_commands(app), help="Perform database migrations."))
+    app.cli.add_command(LazyCommand("seed-db", _command("seed", "seed_db_command"),
+                                    help="Seed the database with sample data"))
+    app.cli.add_command(LazyCommand("cohort-report", _command("reports", "cohort_report_command"),
+                                    help="Compute cross-user cohort metrics over all workouts"))
+    app.cli.add_command(LazyCommand("export-snapshot", _command("snapshots", "export_snapshot_command"),
+                                    help="Export rows changed since the last snapshot to columnar files"))
+    app.cli.add_command(LazyCommand("purge-idempotency-keys", _command("routes", "purge_idempotency_keys_command"),
+                                    help="Delete stored Idempotency-Key responses older than the replay window"))
+
+
+def dispose_engines(app):
+    """Drop pooled connections inherited from a parent process.
+
+    Call in a forked child (e.g. gunicorn's post_fork with --preload) before it
+    touches the database; close=False leaves the parent's connections alone.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    if "replicas" in app.extensions:
+        app.extensions["replicas"].dispose(close=False)
+
+
+def create_app(config=None):
+    app = Flask(__name__)
+
+    # Configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///fitforge.db')
+    app.config['SQLALCHEMY_REPLICA_URLS'] = [
+        url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()
+    ]
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'your-super-secret-key-change-in-production')
+    app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+    app.config['JSON_SORT_KEYS'] = False
+    app.config.update(config or {})
+
+    # Initialize extensions
+    db.init_app(app)
+    init_replicas(app)
+    CORS(app)
+    jwt.init_app(app)
+    bcrypt.init_app(app)
+
+    # Import models and routes so resources are registered before the Api is bound
+    import models  # noqa: F401
+    import routes  # noqa: F401
+    api.init_app(app)
+
+    register_commands(app)
+
+    # Error handlers
+    @app.errorhandler(404)
+    def not_found(error):
+        return jsonify({'error': 'Resource not found'}), 404
+
+    @app.errorhandler(500)
+    def internal_error(error):
+        return jsonify({'error': 'Internal server error'}), 500
+
+    @app.errorhandler(400)
+    def bad_request(error):
+        return jsonify({'error': 'Bad request'}), 400
+
+    # Health check endpoint
+    @app.route('/health', methods=['GET'])
+    def health_check():
+        return jsonify({'status': 'healthy', 'message': 'FitForge API is running'}), 200
+
+    return app
+
+
+app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
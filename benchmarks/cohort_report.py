@@ -0,0 +1,101 @@
+"""Benchmark the cohort report against a synthetic SQLite database.
+
+Builds ``--rows`` workouts (and as many workout_exercises) spread over
+``--users`` users and a year of dates, then times ``reports.cohort_report`` and
+reports the peak resident memory of the parent and worker processes.
+
+Usage:
+    python benchmarks/cohort_report.py --rows 10000000 --workers 4
+"""
+import argparse
+import os
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORKOUT_TYPES = ["Strength Training", "Cardio", "Cycling", "Yoga", "HIIT", "Walking", "Pilates"]
+BATCH = 200_000
+
+
+def build_database(path, rows, users, exercises=10):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, email TEXT, password_hash TEXT);
+        CREATE TABLE exercises (id INTEGER PRIMARY KEY, name TEXT, category TEXT);
+        CREATE TABLE workouts (
+            id INTEGER PRIMARY KEY, type TEXT NOT NULL, duration INTEGER NOT NULL,
+            calories_burned INTEGER, notes TEXT, date DATETIME, user_id INTEGER
+        );
+        CREATE TABLE workout_exercises (
+            id INTEGER PRIMARY KEY, sets INTEGER, reps INTEGER, weight FLOAT,
+            workout_id INTEGER, exercise_id INTEGER
+        );
+    """)
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, '')",
+                     ((i, f"user{i}", f"user{i}@example.com") for i in range(1, users + 1)))
+    conn.executemany("INSERT INTO exercises VALUES (?, ?, 'Strength')",
+                     ((i, f"exercise{i}") for i in range(1, exercises + 1)))
+
+    rng = np.random.default_rng(0)
+    start = np.datetime64("2025-01-01T00:00:00")
+    for low in range(1, rows + 1, BATCH):
+        n = min(BATCH, rows + 1 - low)
+        ids = np.arange(low, low + n)
+        types = rng.integers(0, len(WORKOUT_TYPES), n)
+        durations = rng.integers(10, 121, n)
+        calories = rng.integers(50, 1200, n)
+        user_ids = rng.integers(1, users + 1, n)
+        dates = (start + rng.integers(0, 365 * 86400, n).astype("timedelta64[s]")).astype(str)
+        conn.executemany(
+            "INSERT INTO workouts (id, type, duration, calories_burned, date, user_id) VALUES (?, ?, ?, ?, ?, ?)",
+            zip(ids.tolist(), (WORKOUT_TYPES[t] for t in types), durations.tolist(), calories.tolist(),
+                (d.replace("T", " ") for d in dates), user_ids.tolist()),
+        )
+        conn.executemany(
+            "INSERT INTO workout_exercises VALUES (?, ?, ?, ?, ?, ?)",
+            zip(ids.tolist(), rng.integers(1, 6, n).tolist(), rng.integers(1, 20, n).tolist(),
+                rng.integers(0, 200, n).astype(float).tolist(), ids.tolist(),
+                rng.integers(1, exercises + 1, n).tolist()),
+        )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--database", help="Reuse an existing benchmark database instead of building one.")
+    args = parser.parse_args()
+
+    path = args.database or os.path.join(tempfile.mkdtemp(), "bench.db")
+    if not args.database or not os.path.exists(path):
+        started = time.perf_counter()
+        build_database(path, args.rows, args.users)
+        print(f"Built {args.rows:,} workouts and workout_exercises in {time.perf_counter() - started:.1f}s ({path})")
+
+    from reports import cohort_report
+
+    started = time.perf_counter()
+    report = cohort_report(f"sqlite:///{path}", workers=args.workers, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    parent = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    workouts = sum(t["workouts"] for t in report["workout_types"].values())
+    print(f"Cohort report over {workouts:,} workouts: {elapsed:.2f}s "
+          f"({workouts / elapsed:,.0f} rows/s), peak RSS parent {parent:.0f} MiB, worker {children:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
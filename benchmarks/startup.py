@@ -0,0 +1,88 @@
+"""Benchmark application cold start.
+
+Each sample runs in a fresh interpreter and measures the time to import ``app``
+(which builds the default application) and the time from there to the first
+``/health`` and ``/exercises`` responses. It also checks that CLI-only
+dependencies stay out of the serving process.
+
+Usage:
+    python benchmarks/startup.py --runs 10 --max-import-ms 600 --max-first-request-ms 200
+
+Exits non-zero when a budget is exceeded or a CLI-only module was imported.
+tests/test_startup.py runs one sample with loose budgets as part of the suite.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only CLI commands (migrations, reports, snapshots) should load.
+CLI_ONLY_MODULES = ["flask_migrate", "alembic", "numpy", "pyarrow"]
+
+SAMPLE = """
+import json, sys, time
+started = time.perf_counter()
+from app import app
+from extensions import db
+imported = time.perf_counter()
+with app.app_context():
+    db.create_all()
+prepared = time.perf_counter()
+client = app.test_client()
+health = client.get("/health")
+first = time.perf_counter()
+exercises = client.get("/exercises")
+done = time.perf_counter()
+assert health.status_code == 200 and exercises.status_code == 200
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (first - prepared) * 1000,
+    "first_db_request_ms": (done - first) * 1000,
+    "cli_modules": [m for m in %r if m in sys.modules],
+}))
+""" % (CLI_ONLY_MODULES,)
+
+
+def sample(database):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{database}", PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", SAMPLE], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-first-request-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    database = os.path.join(tempfile.mkdtemp(), "startup.db")
+    samples = [sample(database) for _ in range(args.runs)]
+
+    failures = []
+    for key, budget in [("import_ms", args.max_import_ms), ("first_request_ms", args.max_first_request_ms),
+                        ("first_db_request_ms", None)]:
+        median = statistics.median(s[key] for s in samples)
+        print(f"{key:>20}: median {median:7.1f} ms  (min {min(s[key] for s in samples):.1f}, "
+              f"max {max(s[key] for s in samples):.1f})")
+        if budget is not None and median > budget:
+            failures.append(f"{key} median {median:.1f} ms exceeds {budget:.0f} ms")
+
+    loaded = sorted({m for s in samples for m in s["cli_modules"]})
+    print(f"{'cli-only modules':>20}: {', '.join(loaded) or 'none'}")
+    if loaded:
+        failures.append(f"CLI-only modules imported while serving: {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from flask_sqlalchemy import SQLAlchemy
+from flask_jwt_extended import JWTManager
+from flask_bcrypt import Bcrypt
+from flask_restful import Api
+
+from replicas import RoutingSession
+
+# Extensions are created unbound and attached to an app in create_app(),
+# so models and routes can import them without importing the app.
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+api = Api()
+jwt = JWTManager()
+bcrypt = Bcrypt()
@@ -0,0 +1,11 @@
+# Gunicorn settings, picked up automatically from the working directory:
+#     gunicorn app:app
+
+# Import the app once in the master so workers fork with it already loaded.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Connections pooled before the fork must not be shared between workers.
+    from app import app, dispose_engines
+    dispose_engines(app)
@@ -0,0 +1,39 @@
+"""Track row updates for incremental snapshots
+
+Revision ID: 9b41e6c0d3a2
+Revises: 5d2f8a91c4e7
+Create Date: 2026-10-19 11:02:47.530914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b41e6c0d3a2'
+down_revision = '5d2f8a91c4e7'
+branch_labels = None
+depends_on = None
+
+TABLES = ['users', 'workouts', 'exercises', 'workout_exercises']
+
+
+def upgrade():
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    for table in TABLES:
+        column = sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True)
+        if sqlite:
+            # SQLite cannot ALTER in a column with a CURRENT_TIMESTAMP default, so
+            # the table is rebuilt; existing rows pick up the migration time.
+            with op.batch_alter_table(table, recreate='always') as batch_op:
+                batch_op.add_column(column)
+        else:
+            op.add_column(table, column)
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -1,6 +1,9 @@
-from app import db, bcrypt
+from extensions import db, bcrypt
 from sqlalchemy_serializer import SerializerMixin
 from sqlalchemy.orm import validates
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime, timedelta
 import re
 
 # User model
@@ -11,11 +14,15 @@ class User(db.Model, SerializerMixin):
     username = db.Column(db.String(50), nullable=False, unique=True)
     email = db.Column(db.String(120), nullable=False, unique=True)
     password_hash = db.Column(db.String(128), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), index=True)
 
     # Relationships
     workouts = db.relationship("Workout", back_populates="user", cascade="all, delete-orphan")
+    personal_records = db.relationship("PersonalRecord", cascade="all, delete-orphan")
+    progression_buckets = db.relationship("ProgressionBucket", cascade="all, delete-orphan")
+    idempotency_keys = db.relationship("IdempotencyKey", cascade="all, delete-orphan")
 
-    serialize_rules = ("-workouts.user", "-password_hash")
+    serialize_rules = ("-workouts.user", "-password_hash", "-personal_records", "-progression_buckets", "-idempotency_keys")
 
     # Password handling
     def set_password(self, password):
@@ -59,6 +66,7 @@ class Workout(db.Model, SerializerMixin):
     notes = db.Column(db.Text)
     date = db.Column(db.DateTime, server_default=db.func.now())
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), index=True)
 
     # Relationships
     user = db.relationship("User", back_populates="workouts")
@@ -110,6 +118,7 @@ class Exercise(db.Model, SerializerMixin):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
     category = db.Column(db.String(50))  # e.g., "Cardio", "Strength", "Flexibility"
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), index=True)
 
     # Relationships
     workout_exercises = db.relationship("WorkoutExercise", back_populates="exercise", cascade="all, delete-orphan")
@@ -143,6 +152,7 @@ class WorkoutExercise(db.Model, SerializerMixin):
     weight = db.Column(db.Float)  # User-submittable attribute (in kg/lbs)
     workout_id = db.Column(db.Integer, db.ForeignKey("workouts.id"))
     exercise_id = db.Column(db.Integer, db.ForeignKey("exercises.id"))
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), index=True)
 
     # Relationships
     workout = db.relationship("Workout", back_populates="workout_exercises")
@@ -181,4 +191,182 @@ class WorkoutExercise(db.Model, SerializerMixin):
             'workout_id': self.workout_id,
             'exercise_id': self.exercise_id,
             'exercise': self.exercise.to_dict() if self.exercise else None
-        }
\ No newline at end of file
+        }
+
+# Estimated one-rep max (Epley formula)
+def estimate_one_rep_max(weight, reps):
+    if not weight or not reps:
+        return 0.0
+    if reps == 1:
+        return float(weight)
+    return round(weight * (1 + reps / 30.0), 2)
+
+
+def week_start(date):
+    day = (date or datetime.utcnow()).date()
+    return day - timedelta(days=day.weekday())
+
+
+# Shared aggregate columns for PersonalRecord and ProgressionBucket
+class RecordStatsMixin:
+    max_weight = db.Column(db.Float, default=0.0)
+    max_reps = db.Column(db.Integer, default=0)
+    estimated_one_rep_max = db.Column(db.Float, default=0.0)
+    total_volume = db.Column(db.Float, default=0.0)
+    total_sets = db.Column(db.Integer, default=0)
+    entries = db.Column(db.Integer, default=0)
+
+    @staticmethod
+    def stats(workout_exercise):
+        """Column values for a single WorkoutExercise, as if it were the only entry."""
+        weight = workout_exercise.weight or 0.0
+        reps = workout_exercise.reps or 0
+        sets = workout_exercise.sets or 0
+        return {
+            'max_weight': weight,
+            'max_reps': reps,
+            'estimated_one_rep_max': estimate_one_rep_max(weight, reps),
+            'total_volume': sets * reps * weight,
+            'total_sets': sets,
+            'entries': 1
+        }
+
+    def apply(self, workout_exercise):
+        stats = self.stats(workout_exercise)
+        for column in ('max_weight', 'max_reps', 'estimated_one_rep_max'):
+            setattr(self, column, max(getattr(self, column) or 0, stats[column]))
+        for column in ('total_volume', 'total_sets', 'entries'):
+            setattr(self, column, (getattr(self, column) or 0) + stats[column])
+
+
+# Per-user, per-exercise personal bests, maintained incrementally
+class PersonalRecord(db.Model, RecordStatsMixin, SerializerMixin):
+    __tablename__ = "personal_records"
+    __table_args__ = (db.UniqueConstraint("user_id", "exercise_id"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    exercise_id = db.Column(db.Integer, db.ForeignKey("exercises.id"), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+
+    exercise = db.relationship("Exercise")
+
+    def __repr__(self):
+        return f"<PersonalRecord user={self.user_id} exercise={self.exercise_id}>"
+
+    def to_dict(self):
+        return {
+            'exercise_id': self.exercise_id,
+            'exercise': self.exercise.to_dict() if self.exercise else None,
+            'max_weight': self.max_weight,
+            'max_reps': self.max_reps,
+            'estimated_one_rep_max': self.estimated_one_rep_max,
+            'total_volume': self.total_volume,
+            'total_sets': self.total_sets,
+            'entries': self.entries,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+# Weekly progression buckets, one row per user/exercise/week
+class ProgressionBucket(db.Model, RecordStatsMixin, SerializerMixin):
+    __tablename__ = "progression_buckets"
+    __table_args__ = (db.UniqueConstraint("user_id", "exercise_id", "week_start"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    exercise_id = db.Column(db.Integer, db.ForeignKey("exercises.id"), nullable=False)
+    week_start = db.Column(db.Date, nullable=False)
+
+    def __repr__(self):
+        return f"<ProgressionBucket user={self.user_id} exercise={self.exercise_id} week={self.week_start}>"
+
+    def to_dict(self):
+        return {
+            'week_start': self.week_start.isoformat(),
+            'max_weight': self.max_weight,
+            'max_reps': self.max_reps,
+            'estimated_one_rep_max': self.estimated_one_rep_max,
+            'total_volume': self.total_volume,
+            'total_sets': self.total_sets,
+            'entries': self.entries
+        }
+
+
+# Record maintenance, called from the WorkoutExercise write paths.
+# Neither helper commits; the caller owns the transaction.
+def _upsert_stats(model, keys, stats, **extra):
+    """Insert a stats row, or fold ``stats`` into the existing one in a single statement.
+
+    The row lock taken by INSERT ... ON CONFLICT DO UPDATE serializes concurrent
+    writers, so two requests adding to the same record can't lose an update.
+    """
+    table = model.__table__
+    insert = sqlite_insert if db.engine.dialect.name == "sqlite" else postgresql_insert
+    stmt = insert(table).values(**keys, **stats)
+
+    values = dict(extra)
+    for column in ('max_weight', 'max_reps', 'estimated_one_rep_max'):
+        current, new = db.func.coalesce(table.c[column], 0), stmt.excluded[column]
+        values[column] = db.case((current < new, new), else_=current)
+    for column in ('total_volume', 'total_sets', 'entries'):
+        values[column] = db.func.coalesce(table.c[column], 0) + stmt.excluded[column]
+
+    db.session.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=values))
+
+
+def record_workout_exercise(workout_exercise, workout):
+    """Fold a newly added WorkoutExercise into the owner's PR and weekly bucket."""
+    keys = {'user_id': workout.user_id, 'exercise_id': workout_exercise.exercise_id}
+    stats = RecordStatsMixin.stats(workout_exercise)
+
+    _upsert_stats(PersonalRecord, keys, stats, updated_at=db.func.now())
+    _upsert_stats(ProgressionBucket, dict(keys, week_start=week_start(workout.date)), stats)
+
+
+def recompute_records(user_id, exercise_id, weeks=None):
+    """Rebuild one exercise's PR (and the given weekly buckets) from the remaining rows.
+
+    Must run after the removed WorkoutExercise rows have been flushed.
+    """
+    rows = (
+        db.session.query(WorkoutExercise, Workout.date)
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .filter(Workout.user_id == user_id, WorkoutExercise.exercise_id == exercise_id)
+        .all()
+    )
+
+    PersonalRecord.query.filter_by(user_id=user_id, exercise_id=exercise_id).delete()
+    if rows:
+        record = PersonalRecord(user_id=user_id, exercise_id=exercise_id)
+        for workout_exercise, _ in rows:
+            record.apply(workout_exercise)
+        db.session.add(record)
+
+    for week in weeks or ():
+        ProgressionBucket.query.filter_by(user_id=user_id, exercise_id=exercise_id, week_start=week).delete()
+        bucket = ProgressionBucket(user_id=user_id, exercise_id=exercise_id, week_start=week)
+        for workout_exercise, date in rows:
+            if week_start(date) == week:
+                bucket.apply(workout_exercise)
+        if bucket.entries:
+            db.session.add(bucket)
+
+
+# Stored responses for requests sent with an Idempotency-Key header
+class IdempotencyKey(db.Model, SerializerMixin):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (db.UniqueConstraint("user_id", "key"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(255), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    response_body = db.Column(db.Text, nullable=False)
+    # Stamped in Python (UTC) because expiry is checked against datetime.utcnow(); the
+    # database's now() follows the session time zone on Postgres.
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=db.func.now(), index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key} user={self.user_id}>"
@@ -0,0 +1,167 @@
+"""Read-replica routing for read-only resource methods.
+
+Replica URLs come from ``DATABASE_REPLICA_URLS`` (comma-separated, read into
+``SQLALCHEMY_REPLICA_URLS``). Their engines live on the router in
+``app.extensions["replicas"]``, not in ``SQLALCHEMY_BINDS``, so ``db.create_all()``,
+``db.drop_all()`` and migrations only ever touch the primary. Resource methods
+wrapped in ``@read_only`` run their queries against one replica, picked round-robin. Replicas that fail
+with a connection error are skipped for ``SQLALCHEMY_REPLICA_COOLDOWN`` seconds,
+and the request is retried on the primary.
+
+After a request writes, that user's reads stay on the primary for
+``SQLALCHEMY_REPLICA_STICKY_SECONDS`` so they see their own writes. This is
+tracked per user in-process and in a cookie, so it also holds across workers
+for clients that keep cookies.
+
+Locally, two SQLite files can stand in for primary and replica:
+    DATABASE_URL=sqlite:///primary.db DATABASE_REPLICA_URLS=sqlite:///replica.db
+"""
+from functools import wraps
+import itertools
+import os
+import threading
+import time
+
+from flask import current_app, g, has_app_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from flask_sqlalchemy.session import Session
+from jwt.exceptions import PyJWTError
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.exc import OperationalError
+
+BIND_PREFIX = "replica_"
+STICKY_COOKIE = "fitforge_primary_until"
+
+
+class RoutingSession(Session):
+    """Sends reads to the replica chosen for the current request, if any.
+
+    Anything with pending changes, and every flush, stays on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and has_app_context()
+            and g.get("replica_bind")
+            and not self._flushing
+            and not (self.new or self.dirty or self.deleted)
+        ):
+            return current_app.extensions["replicas"].engines[g.replica_bind]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_write(session, flush_context):
+    if has_app_context():
+        g.db_wrote = True
+
+
+class ReplicaRouter:
+    def __init__(self, engines, cooldown, sticky_seconds):
+        self.engines = engines
+        self.keys = sorted(engines)
+        self.cooldown = cooldown
+        self.sticky_seconds = sticky_seconds
+        self._next = itertools.count()
+        self._down_until = {}
+        self._primary_until = {}
+        self._lock = threading.Lock()
+
+    def choose(self):
+        """Next healthy replica in round-robin order, or None to use the primary."""
+        now = time.monotonic()
+        for _ in range(len(self.keys)):
+            key = self.keys[next(self._next) % len(self.keys)]
+            if self._down_until.get(key, 0) <= now:
+                return key
+        return None
+
+    def dispose(self, close=True):
+        for engine in self.engines.values():
+            engine.dispose(close=close)
+
+    def mark_down(self, key):
+        self._down_until[key] = time.monotonic() + self.cooldown
+
+    def record_write(self, user_id):
+        if user_id is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._primary_until) > 10000:
+                self._primary_until = {k: v for k, v in self._primary_until.items() if v > now}
+            self._primary_until[user_id] = now + self.sticky_seconds
+
+    def is_sticky(self, user_id):
+        until = request.cookies.get(STICKY_COOKIE, "")
+        if until.isdigit() and int(until) > time.time():
+            return True
+        return user_id is not None and self._primary_until.get(user_id, 0) > time.monotonic()
+
+
+def _current_user_id():
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except (JWTExtendedException, PyJWTError):
+        return None
+
+
+def _replica_engine(app, url):
+    url = make_url(url)
+    # Relative SQLite paths resolve against the instance folder, as Flask-SQLAlchemy does for the primary.
+    database = url.database
+    if url.get_backend_name() == "sqlite" and database and database != ":memory:" and not os.path.isabs(database):
+        url = url.set(database=os.path.join(app.instance_path, database))
+    return create_engine(url, pool_pre_ping=True)
+
+
+def init_replicas(app):
+    urls = app.config.get("SQLALCHEMY_REPLICA_URLS") or []
+    if not urls:
+        return
+
+    router = ReplicaRouter(
+        {f"{BIND_PREFIX}{i}": _replica_engine(app, url) for i, url in enumerate(urls)},
+        cooldown=app.config.get("SQLALCHEMY_REPLICA_COOLDOWN", 30),
+        sticky_seconds=app.config.get("SQLALCHEMY_REPLICA_STICKY_SECONDS", 5),
+    )
+    app.extensions["replicas"] = router
+
+    @app.after_request
+    def remember_write(response):
+        if g.get("db_wrote"):
+            router.record_write(_current_user_id())
+            response.set_cookie(
+                STICKY_COOKIE, str(int(time.time() + router.sticky_seconds)),
+                max_age=router.sticky_seconds, httponly=True, samesite="Lax"
+            )
+        return response
+
+
+def read_only(fn):
+    """Run a resource method against a replica when one is configured and healthy."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        router = current_app.extensions.get("replicas")
+        if router is None or router.is_sticky(_current_user_id()):
+            return fn(*args, **kwargs)
+
+        key = router.choose()
+        if key is None:
+            return fn(*args, **kwargs)
+
+        g.replica_bind = key
+        try:
+            return fn(*args, **kwargs)
+        except OperationalError:
+            # Replica unreachable: take it out of rotation and answer from the primary.
+            current_app.extensions["sqlalchemy"].session.rollback()
+            router.mark_down(key)
+            g.replica_bind = None
+            return fn(*args, **kwargs)
+        finally:
+            g.replica_bind = None
+    return wrapper
@@ -0,0 +1,302 @@
+"""Cohort reports over the full workouts / workout_exercises tables.
+
+Rows are streamed from the database in id-range partitions, one partition per
+worker process, and each partition is read in fixed-size chunks that are turned
+into NumPy column arrays and reduced immediately. Workers only hand back small
+partial aggregates (histograms, per-type sums and the distinct user/week pairs),
+so memory stays bounded by the number of users, weeks and workout types rather
+than by the number of rows.
+
+Usage:
+    flask cohort-report [--workers N] [--chunk-size N] [--max-weeks N] [--output FILE]
+    python reports.py
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+import json
+import os
+
+import click
+import numpy as np
+from flask.cli import with_appcontext
+from sqlalchemy import create_engine, text
+
+from extensions import db
+
+CHUNK_SIZE = 100_000
+
+# Histogram bins; the last bin of each also collects anything above the range.
+DURATION_BINS = np.arange(0, 361, 15)
+CALORIE_BINS = np.arange(0, 2001, 100)
+
+# 1970-01-01 was a Thursday, so Monday-based weeks start at epoch day 4.
+EPOCH = date(1970, 1, 1)
+
+_engines = {}
+
+
+def _engine(url):
+    # One engine per worker process, reused across the partitions it handles.
+    if url not in _engines:
+        _engines[url] = create_engine(url)
+    return _engines[url]
+
+
+def _epoch_day(dialect):
+    if dialect == "sqlite":
+        return "CAST(julianday(w.date) - 2440587.5 AS INTEGER)"
+    return "CAST(FLOOR(EXTRACT(EPOCH FROM w.date) / 86400) AS INTEGER)"
+
+
+def _week_start(week):
+    return (EPOCH + timedelta(days=int(week) * 7 + 4)).isoformat()
+
+
+def _chunks(url, sql, params, chunk_size):
+    """Yield each chunk of ``sql`` as a tuple of column sequences."""
+    with _engine(url).connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(text(sql), params)
+        for rows in result.partitions(chunk_size):
+            yield tuple(zip(*rows))
+
+
+def _encode(values, index):
+    # Map strings to small integer codes; ``index`` is shared across chunks.
+    return np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int64, count=len(values))
+
+
+def _binned(values, bins):
+    return np.clip(np.searchsorted(bins, values, side="right") - 1, 0, len(bins) - 2)
+
+
+def _grow(array, rows):
+    if array.shape[0] >= rows:
+        return array
+    return np.concatenate([array, np.zeros((rows - array.shape[0],) + array.shape[1:], dtype=array.dtype)])
+
+
+def _scan_workouts(url, low, high, stride, chunk_size):
+    """Partial aggregates for workouts with ``low <= id < high``."""
+    dialect = _engine(url).dialect.name
+    sql = (
+        f"SELECT w.type, w.duration, COALESCE(w.calories_burned, -1), "
+        f"COALESCE(w.user_id, -1), COALESCE({_epoch_day(dialect)}, -1) "
+        f"FROM workouts w WHERE w.id >= :low AND w.id < :high"
+    )
+    types = {}
+    counts = np.zeros(0, dtype=np.int64)
+    duration_sum = np.zeros(0)
+    duration_sq = np.zeros(0)
+    calorie_counts = np.zeros(0, dtype=np.int64)
+    calorie_sum = np.zeros(0)
+    calorie_sq = np.zeros(0)
+    duration_hist = np.zeros((0, len(DURATION_BINS) - 1), dtype=np.int64)
+    calorie_hist = np.zeros((0, len(CALORIE_BINS) - 1), dtype=np.int64)
+    activity = []
+
+    for workout_types, durations, calories, user_ids, days in _chunks(url, sql, {"low": low, "high": high}, chunk_size):
+        codes = _encode(workout_types, types)
+        durations = np.asarray(durations, dtype=np.float64)
+        calories = np.asarray(calories, dtype=np.float64)
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        days = np.asarray(days, dtype=np.int64)
+        n = len(types)
+
+        counts = _grow(counts, n) + np.bincount(codes, minlength=n)
+        duration_sum = _grow(duration_sum, n) + np.bincount(codes, weights=durations, minlength=n)
+        duration_sq = _grow(duration_sq, n) + np.bincount(codes, weights=durations * durations, minlength=n)
+        bins = len(DURATION_BINS) - 1
+        duration_hist = _grow(duration_hist, n) + np.bincount(
+            codes * bins + _binned(durations, DURATION_BINS), minlength=n * bins
+        ).reshape(n, bins)
+
+        has_calories = calories >= 0
+        cal_codes, cal_values = codes[has_calories], calories[has_calories]
+        calorie_counts = _grow(calorie_counts, n) + np.bincount(cal_codes, minlength=n)
+        calorie_sum = _grow(calorie_sum, n) + np.bincount(cal_codes, weights=cal_values, minlength=n)
+        calorie_sq = _grow(calorie_sq, n) + np.bincount(cal_codes, weights=cal_values * cal_values, minlength=n)
+        bins = len(CALORIE_BINS) - 1
+        calorie_hist = _grow(calorie_hist, n) + np.bincount(
+            cal_codes * bins + _binned(cal_values, CALORIE_BINS), minlength=n * bins
+        ).reshape(n, bins)
+
+        # Distinct (week, user) pairs encoded as a single int64 key.
+        active = (user_ids >= 0) & (days >= 0)
+        weeks = (days[active] - 4) // 7
+        activity.append(np.unique(weeks * stride + user_ids[active]))
+        if len(activity) > 8:
+            activity = [np.unique(np.concatenate(activity))]
+
+    return {
+        "types": list(types),
+        "count": counts,
+        "duration_sum": duration_sum,
+        "duration_sq": duration_sq,
+        "duration_hist": duration_hist,
+        "calorie_count": calorie_counts,
+        "calorie_sum": calorie_sum,
+        "calorie_sq": calorie_sq,
+        "calorie_hist": calorie_hist,
+        "activity": np.unique(np.concatenate(activity)) if activity else np.zeros(0, dtype=np.int64),
+    }
+
+
+def _scan_workout_exercises(url, low, high, chunk_size):
+    """Per-workout-type exercise totals for workout_exercises with ``low <= id < high``."""
+    sql = (
+        "SELECT w.type, COALESCE(we.sets, 0), COALESCE(we.reps, 0), COALESCE(we.weight, 0) "
+        "FROM workout_exercises we JOIN workouts w ON we.workout_id = w.id "
+        "WHERE we.id >= :low AND we.id < :high"
+    )
+    types = {}
+    entries = np.zeros(0, dtype=np.int64)
+    sets_sum = np.zeros(0)
+    volume_sum = np.zeros(0)
+
+    for workout_types, sets, reps, weights in _chunks(url, sql, {"low": low, "high": high}, chunk_size):
+        codes = _encode(workout_types, types)
+        sets = np.asarray(sets, dtype=np.float64)
+        volume = sets * np.asarray(reps, dtype=np.float64) * np.asarray(weights, dtype=np.float64)
+        n = len(types)
+        entries = _grow(entries, n) + np.bincount(codes, minlength=n)
+        sets_sum = _grow(sets_sum, n) + np.bincount(codes, weights=sets, minlength=n)
+        volume_sum = _grow(volume_sum, n) + np.bincount(codes, weights=volume, minlength=n)
+
+    return {"types": list(types), "entries": entries, "sets_sum": sets_sum, "volume_sum": volume_sum}
+
+
+def _ranges(conn, table, parts):
+    low, high = conn.execute(text(f"SELECT MIN(id), MAX(id) FROM {table}")).one()
+    if low is None:
+        return []
+    step = max(1, -(-(high - low + 1) // parts))
+    return [(start, min(start + step, high + 1)) for start in range(low, high + 1, step)]
+
+
+def _merge_by_type(partials, fields):
+    merged = {}
+    for partial in partials:
+        for i, name in enumerate(partial["types"]):
+            if name not in merged:
+                merged[name] = {field: partial[field][i] for field in fields}
+            else:
+                for field in fields:
+                    merged[name][field] = merged[name][field] + partial[field][i]
+    return merged
+
+
+def _summary(count, total, squares, hist, bins):
+    if not count:
+        return {"count": 0, "mean": None, "std": None, "histogram": None}
+    mean = total / count
+    return {
+        "count": int(count),
+        "mean": round(float(mean), 2),
+        "std": round(float(np.sqrt(max(squares / count - mean * mean, 0.0))), 2),
+        "histogram": {"bin_edges": bins.tolist(), "counts": hist.tolist()},
+    }
+
+
+def _cohorts(activity, stride, max_weeks):
+    if not len(activity):
+        return {}, {}
+    weeks, users = np.divmod(activity, stride)
+
+    first_week = weeks[0]
+    weekly_active = np.bincount(weeks - first_week)
+
+    # ``activity`` is sorted week-major, so a user's first key is their cohort week.
+    user_ids, first = np.unique(users, return_index=True)
+    cohort_of = np.empty(int(user_ids.max()) + 1, dtype=np.int64)
+    cohort_of[user_ids] = weeks[first]
+    cohort = cohort_of[users]
+    offset = weeks - cohort
+    keep = offset <= max_weeks
+    table = np.bincount(
+        (cohort[keep] - first_week) * (max_weeks + 1) + offset[keep],
+        minlength=len(weekly_active) * (max_weeks + 1),
+    ).reshape(-1, max_weeks + 1)
+
+    wau = {_week_start(first_week + i): int(n) for i, n in enumerate(weekly_active) if n}
+    retention = {}
+    for i, row in enumerate(table):
+        if row[0]:
+            retention[_week_start(first_week + i)] = {
+                "size": int(row[0]),
+                # Only offsets that have already elapsed for this cohort.
+                "retention": [round(float(n) / row[0], 4) for n in row[:len(weekly_active) - i]],
+            }
+    return wau, retention
+
+
+def cohort_report(url, workers=None, chunk_size=CHUNK_SIZE, max_weeks=12):
+    """Build the cohort report for the database at ``url``."""
+    workers = workers or os.cpu_count() or 1
+    with create_engine(url).connect() as conn:
+        stride = (conn.execute(text("SELECT MAX(id) FROM users")).scalar() or 0) + 1
+        workout_ranges = _ranges(conn, "workouts", workers)
+        exercise_ranges = _ranges(conn, "workout_exercises", workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        workout_jobs = [pool.submit(_scan_workouts, url, low, high, stride, chunk_size) for low, high in workout_ranges]
+        exercise_jobs = [pool.submit(_scan_workout_exercises, url, low, high, chunk_size) for low, high in exercise_ranges]
+        workout_parts = [job.result() for job in workout_jobs]
+        exercise_parts = [job.result() for job in exercise_jobs]
+
+    by_type = _merge_by_type(workout_parts, [
+        "count", "duration_sum", "duration_sq", "duration_hist",
+        "calorie_count", "calorie_sum", "calorie_sq", "calorie_hist",
+    ])
+    exercises_by_type = _merge_by_type(exercise_parts, ["entries", "sets_sum", "volume_sum"])
+    activity = np.unique(np.concatenate([part["activity"] for part in workout_parts])) if workout_parts else []
+    weekly_active_users, retention = _cohorts(activity, stride, max_weeks)
+
+    workout_types = {}
+    for name, agg in sorted(by_type.items()):
+        exercises = exercises_by_type.get(name, {})
+        workout_types[name] = {
+            "workouts": int(agg["count"]),
+            "duration": _summary(agg["count"], agg["duration_sum"], agg["duration_sq"],
+                                 agg["duration_hist"], DURATION_BINS),
+            "calories_burned": _summary(agg["calorie_count"], agg["calorie_sum"], agg["calorie_sq"],
+                                        agg["calorie_hist"], CALORIE_BINS),
+            "exercise_entries": int(exercises.get("entries", 0)),
+            "total_sets": int(exercises.get("sets_sum", 0)),
+            "total_volume": round(float(exercises.get("volume_sum", 0.0)), 2),
+        }
+
+    return {
+        "weekly_active_users": weekly_active_users,
+        "retention": retention,
+        "workout_types": workout_types,
+    }
+
+
+def run_cohort_report(workers=None, chunk_size=CHUNK_SIZE, max_weeks=12, output=None):
+    url = db.engine.url.render_as_string(hide_password=False)
+    report = cohort_report(url, workers=workers, chunk_size=chunk_size, max_weeks=max_weeks)
+    payload = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(payload)
+        print(f"Cohort report written to {output}")
+    else:
+        print(payload)
+
+
+# Add CLI command
+@click.command("cohort-report")
+@click.option("--workers", type=int, default=None, help="Worker processes (defaults to CPU count).")
+@click.option("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows fetched per chunk.")
+@click.option("--max-weeks", type=int, default=12, help="Retention horizon in weeks.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Write JSON here instead of stdout.")
+@with_appcontext
+def cohort_report_command(workers, chunk_size, max_weeks, output):
+    """Compute cross-user cohort metrics over all workouts"""
+    run_cohort_report(workers, chunk_size, max_weeks, output)
+
+
+if __name__ == "__main__":
+    from app import app
+    with app.app_context():
+        run_cohort_report()
@@ -1,9 +1,21 @@
+import click
 from flask import request, jsonify
+from flask.cli import with_appcontext
 from flask_restful import Resource
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from sqlalchemy.exc import IntegrityError
-from app import api, db
-from models import User, Workout, Exercise, WorkoutExercise
+from extensions import api, db
+from replicas import read_only
+from models import (
+    User, Workout, Exercise, WorkoutExercise, PersonalRecord, ProgressionBucket, IdempotencyKey,
+    record_workout_exercise, recompute_records, week_start
+)
+from datetime import datetime, timedelta
+import hashlib
+import json
+
+# Keys older than this are ignored; schedule `flask purge-idempotency-keys` to delete them.
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
 
 # Simple validation functions
 def validate_email(email):
@@ -15,6 +27,33 @@ def validate_password(password):
 def validate_username(username):
     return len(username.strip()) >= 3 if username else False
 
+# Idempotency-Key handling
+def request_hash(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+def stored_response(key, user_id, data):
+    """Replay the stored response for ``key``, or None if the request has not been seen."""
+    record = IdempotencyKey.query.filter_by(user_id=user_id, key=key).first()
+    if not record:
+        return None
+    if record.created_at and record.created_at < datetime.utcnow() - IDEMPOTENCY_KEY_TTL:
+        db.session.delete(record)
+        db.session.commit()
+        return None
+    if record.request_hash != request_hash(data):
+        return {"message": "Idempotency-Key was already used with a different request."}, 422
+    return json.loads(record.response_body), record.status_code
+
+def store_response(key, user_id, data, body, status_code):
+    # Added to the caller's transaction so the response is stored only if its work commits.
+    db.session.add(IdempotencyKey(
+        key=key,
+        user_id=user_id,
+        request_hash=request_hash(data),
+        status_code=status_code,
+        response_body=json.dumps(body)
+    ))
+
 # Authentication Resources
 class Register(Resource):
     def post(self):
@@ -67,12 +106,14 @@ class Login(Resource):
 # User Resources
 class Users(Resource):
     @jwt_required()
+    @read_only
     def get(self):
         users = User.query.all()
         return [user.to_dict() for user in users], 200
 
 class UserById(Resource):
     @jwt_required()
+    @read_only
     def get(self, id):
         user = User.query.get_or_404(id)
         return user.to_dict(), 200
@@ -104,6 +145,7 @@ class UserById(Resource):
 # Workout Resources
 class Workouts(Resource):
     @jwt_required()
+    @read_only
     def get(self):
         current_user_id = get_jwt_identity()
         workouts = Workout.query.filter_by(user_id=current_user_id).order_by(Workout.date.desc()).all()
@@ -112,28 +154,73 @@ class Workouts(Resource):
     @jwt_required()
     def post(self):
         data = request.get_json()
+        current_user_id = get_jwt_identity()
+        idempotency_key = request.headers.get("Idempotency-Key")
+
+        if idempotency_key:
+            replay = stored_response(idempotency_key, current_user_id, data)
+            if replay:
+                return replay
 
         if not data.get("type") or not data.get("duration"):
             return {"message": "Workout type and duration are required."}, 400
 
+        exercises = data.get("exercises") or []
+        if not isinstance(exercises, list) or not all(isinstance(e, dict) and e.get("exercise_id") for e in exercises):
+            return {"message": "Each exercise requires an exercise ID."}, 400
+
+        try:
+            exercise_ids = [int(e["exercise_id"]) for e in exercises]
+        except (TypeError, ValueError):
+            return {"message": "Exercise ID must be an integer."}, 400
+
+        # One lookup for every referenced exercise. Keeping the rows loaded lets to_dict()
+        # resolve each WorkoutExercise.exercise from the identity map instead of querying again.
+        unique_ids = set(exercise_ids)
+        found = Exercise.query.filter(Exercise.id.in_(unique_ids)).all() if unique_ids else []
+        if len(found) != len(unique_ids):
+            return {"message": "Exercise not found."}, 400
+
         try:
             workout = Workout(
                 type=data['type'],
                 duration=data['duration'],
                 calories_burned=data.get('calories_burned'),
                 notes=data.get('notes'),
-                user_id=get_jwt_identity()
+                user_id=current_user_id
             )
+            for item, exercise_id in zip(exercises, exercise_ids):
+                workout.workout_exercises.append(WorkoutExercise(
+                    exercise_id=exercise_id,
+                    sets=item.get('sets'),
+                    reps=item.get('reps'),
+                    weight=item.get('weight')
+                ))
             db.session.add(workout)
+            db.session.flush()
+            for workout_exercise in workout.workout_exercises:
+                record_workout_exercise(workout_exercise, workout)
+
+            body = workout.to_dict()
+            if idempotency_key:
+                store_response(idempotency_key, current_user_id, data, body, 201)
             db.session.commit()
-            return workout.to_dict(), 201
+            return body, 201
         except ValueError as e:
             db.session.rollback()
             return {"message": str(e)}, 400
+        except IntegrityError:
+            # A concurrent retry with the same key committed first.
+            db.session.rollback()
+            replay = idempotency_key and stored_response(idempotency_key, current_user_id, data)
+            if replay:
+                return replay
+            return {"message": "Could not create workout."}, 409
 
 
 class WorkoutById(Resource):
     @jwt_required()
+    @read_only
     def get(self, id):
         workout = Workout.query.get_or_404(id)
         if workout.user_id != get_jwt_identity():
@@ -164,13 +251,19 @@ class WorkoutById(Resource):
         workout = Workout.query.get_or_404(id)
         if workout.user_id != get_jwt_identity():
             return {"message": "Not authorized to delete this workout."}, 403
-            
+
+        exercise_ids = {we.exercise_id for we in workout.workout_exercises}
+        week = week_start(workout.date)
         db.session.delete(workout)
+        db.session.flush()
+        for exercise_id in exercise_ids:
+            recompute_records(workout.user_id, exercise_id, weeks=[week])
         db.session.commit()
         return {"message": "Workout deleted successfully."}, 204
 
 # Exercise Resources
 class Exercises(Resource):
+    @read_only
     def get(self):
         exercises = Exercise.query.all()
         return [exercise.to_dict() for exercise in exercises], 200
@@ -220,11 +313,15 @@ class WorkoutExercises(Resource):
                 weight=data.get('weight')
             )
             db.session.add(workout_exercise)
+            record_workout_exercise(workout_exercise, workout)
             db.session.commit()
             return workout_exercise.to_dict(), 201
         except ValueError as e:
             db.session.rollback()
             return {"message": str(e)}, 400
+        except IntegrityError:
+            db.session.rollback()
+            return {"message": "Exercise not found."}, 400
 
 class WorkoutExerciseById(Resource):
     @jwt_required()
@@ -234,11 +331,39 @@ class WorkoutExerciseById(Resource):
         # Verify user owns the workout
         if workout_exercise.workout.user_id != get_jwt_identity():
             return {"message": "Not authorized to delete this exercise."}, 403
-            
+
+        workout = workout_exercise.workout
         db.session.delete(workout_exercise)
+        db.session.flush()
+        recompute_records(workout.user_id, workout_exercise.exercise_id, weeks=[week_start(workout.date)])
         db.session.commit()
         return {"message": "Exercise removed from workout."}, 204
 
+# Personal Record Resources
+class PersonalRecords(Resource):
+    @jwt_required()
+    @read_only
+    def get(self):
+        records = PersonalRecord.query.filter_by(user_id=get_jwt_identity()).all()
+        return [record.to_dict() for record in records], 200
+
+class PersonalRecordByExercise(Resource):
+    @jwt_required()
+    @read_only
+    def get(self, exercise_id):
+        current_user_id = get_jwt_identity()
+        record = PersonalRecord.query.filter_by(user_id=current_user_id, exercise_id=exercise_id).first()
+        if not record:
+            return {"message": "No records for this exercise."}, 404
+
+        buckets = ProgressionBucket.query.filter_by(
+            user_id=current_user_id, exercise_id=exercise_id
+        ).order_by(ProgressionBucket.week_start).all()
+        return {
+            **record.to_dict(),
+            "progression": [bucket.to_dict() for bucket in buckets]
+        }, 200
+
 # Route Registration
 api.add_resource(Register, "/register")
 api.add_resource(Login, "/login")
@@ -248,4 +373,16 @@ api.add_resource(Workouts, "/workouts")
 api.add_resource(WorkoutById, "/workouts/<int:id>")
 api.add_resource(Exercises, "/exercises")
 api.add_resource(WorkoutExercises, "/workout-exercises")
-api.add_resource(WorkoutExerciseById, "/workout-exercises/<int:id>")
\ No newline at end of file
+api.add_resource(WorkoutExerciseById, "/workout-exercises/<int:id>")
+api.add_resource(PersonalRecords, "/personal-records")
+api.add_resource(PersonalRecordByExercise, "/personal-records/<int:exercise_id>")
+
+# Add CLI command
+@click.command("purge-idempotency-keys")
+@with_appcontext
+def purge_idempotency_keys_command():
+    """Delete stored Idempotency-Key responses older than the replay window"""
+    cutoff = datetime.utcnow() - IDEMPOTENCY_KEY_TTL
+    deleted = IdempotencyKey.query.filter(IdempotencyKey.created_at < cutoff).delete()
+    db.session.commit()
+    print(f"Deleted {deleted} expired idempotency keys.")
@@ -0,0 +1,205 @@
+"""Incremental columnar snapshots of the FitForge tables for offline analysis.
+
+Each run exports only the rows whose ``updated_at`` falls in ``[watermark, cutoff)``,
+where ``watermark`` is the previous run's cutoff and ``cutoff`` is the database
+clock when the run starts minus ``--margin-seconds`` (default 300). ``updated_at``
+is stamped when the writing transaction runs, not when it commits, so the margin
+keeps rows from transactions still open at export time out of this run and in
+the next one. Transactions open for longer than the margin can still be missed.
+Rows are written as hive-partitioned Arrow IPC (memory-mappable) or Parquet files:
+
+    snapshots/workouts/day=2026-10-19/part-20261019T110247-0.arrow
+
+Workouts and workout exercises are partitioned by workout date, users and
+exercises by the day they last changed. An updated row is written again in a
+later part file, so readers should keep the row with the latest ``updated_at``
+per ``id``. Deletes are not tracked; use ``--full`` to rebuild from scratch.
+A snapshot keeps the format it was started with; switching needs ``--full``.
+
+Usage:
+    flask export-snapshot [--output-dir DIR] [--format arrow|parquet] [--full] [--margin-seconds N]
+    python snapshots.py
+"""
+from datetime import datetime, timedelta
+import json
+import os
+import shutil
+
+import click
+import pyarrow as pa
+import pyarrow.dataset as ds
+from flask.cli import with_appcontext
+
+from extensions import db
+from models import User, Workout, Exercise, WorkoutExercise
+
+SNAPSHOT_DIR = "snapshots"
+MANIFEST = "_manifest.json"
+CHUNK_SIZE = 50_000
+MARGIN_SECONDS = 300
+TABLES = ["users", "exercises", "workouts", "workout_exercises"]
+
+# Bounds are bound as plain strings in the same shape SQLite's CURRENT_TIMESTAMP
+# stores; SQLAlchemy's datetime binds add microseconds and would compare wrong
+# as text. Postgres casts the literal to a timestamp.
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+FORMATS = {"arrow": ("ipc", "arrow"), "parquet": ("parquet", "parquet")}
+
+PARTITIONING = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+
+
+def _arrow_type(column):
+    if isinstance(column.type, db.Integer):
+        return pa.int64()
+    if isinstance(column.type, db.Float):
+        return pa.float64()
+    if isinstance(column.type, db.DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, db.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _exports():
+    """(table, columns, select, updated_at) per table; each select ends with the partition day."""
+    user_columns = [c for c in User.__table__.columns if c.name != "password_hash"]
+    exercise_columns = list(Exercise.__table__.columns)
+    workout_columns = list(Workout.__table__.columns)
+    workout_exercise_columns = list(WorkoutExercise.__table__.columns)
+
+    return [
+        ("users", user_columns, db.select(*user_columns, User.updated_at.label("day")), User.updated_at),
+        ("exercises", exercise_columns, db.select(*exercise_columns, Exercise.updated_at.label("day")),
+         Exercise.updated_at),
+        ("workouts", workout_columns, db.select(*workout_columns, Workout.date.label("day")), Workout.updated_at),
+        (
+            "workout_exercises",
+            workout_exercise_columns,
+            db.select(*workout_exercise_columns, Workout.date.label("day"))
+            .join(Workout, WorkoutExercise.workout_id == Workout.id),
+            WorkoutExercise.updated_at,
+        ),
+    ]
+
+
+def _batches(conn, stmt, schema, chunk_size, counter):
+    """Stream ``stmt`` as record batches, deriving the ``day`` partition from its last column."""
+    result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(stmt)
+    for rows in result.partitions(chunk_size):
+        columns = list(zip(*rows))
+        days = [value.date().isoformat() if value else "unknown" for value in columns.pop()]
+        arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+        arrays.append(pa.array(days, type=pa.string()))
+        counter[0] += len(rows)
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _read_manifest(path):
+    if not os.path.exists(path):
+        return {"watermark": None, "runs": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(path, manifest):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _clear_snapshot(output_dir):
+    # Only remove what this module writes; output_dir may hold other files.
+    for table in TABLES:
+        path = os.path.join(output_dir, table)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+
+def export_snapshot(output_dir=SNAPSHOT_DIR, file_format="arrow", full=False, chunk_size=CHUNK_SIZE,
+                    margin_seconds=MARGIN_SECONDS):
+    """Export rows changed since the last snapshot; returns rows written per table."""
+    dataset_format, extension = FORMATS[file_format]
+    manifest_path = os.path.join(output_dir, MANIFEST)
+
+    if full:
+        _clear_snapshot(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _read_manifest(manifest_path)
+    if manifest["runs"] and manifest["runs"][-1]["format"] != file_format:
+        raise ValueError(
+            f"Snapshot in {output_dir} is {manifest['runs'][-1]['format']}; use --full to rewrite it as {file_format}."
+        )
+    watermark = manifest["watermark"]
+
+    with db.engine.connect() as conn:
+        now = conn.execute(db.select(db.func.now())).scalar()
+        if isinstance(now, str):
+            now = datetime.fromisoformat(now)
+        cutoff = (now - timedelta(seconds=margin_seconds)).strftime(TIMESTAMP_FORMAT)
+        if watermark is not None and cutoff < watermark:
+            cutoff = watermark
+        run_id = now.strftime("%Y%m%dT%H%M%S")
+
+        written = {}
+        for table, columns, stmt, updated_at in _exports():
+            stmt = stmt.where(updated_at < db.literal(cutoff, db.String))
+            if watermark is not None:
+                stmt = stmt.where(updated_at >= db.literal(watermark, db.String))
+            schema = pa.schema(
+                [pa.field(c.name, _arrow_type(c)) for c in columns] + [pa.field("day", pa.string())]
+            )
+
+            counter = [0]
+            ds.write_dataset(
+                _batches(conn, stmt, schema, chunk_size, counter),
+                os.path.join(output_dir, table),
+                schema=schema,
+                format=dataset_format,
+                partitioning=PARTITIONING,
+                basename_template=f"part-{run_id}-{{i}}.{extension}",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            written[table] = counter[0]
+
+    # The watermark only moves once every table has been written.
+    manifest["watermark"] = cutoff
+    manifest["runs"].append({"id": run_id, "format": file_format, "cutoff": cutoff, "rows": written})
+    _write_manifest(manifest_path, manifest)
+    return written
+
+
+def run_export(output_dir=SNAPSHOT_DIR, file_format="arrow", full=False, chunk_size=CHUNK_SIZE,
+               margin_seconds=MARGIN_SECONDS):
+    written = export_snapshot(output_dir, file_format, full, chunk_size, margin_seconds)
+    for table, rows in written.items():
+        print(f"Exported {rows} {table} rows")
+    print(f"Snapshot written to {output_dir}")
+
+
+# Add CLI command
+@click.command("export-snapshot")
+@click.option("--output-dir", default=SNAPSHOT_DIR, help="Snapshot root directory.")
+@click.option("--format", "file_format", type=click.Choice(list(FORMATS)), default="arrow",
+              help="Arrow IPC (memory-mappable) or Parquet.")
+@click.option("--full", is_flag=True, help="Discard the existing snapshot and export every row.")
+@click.option("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows fetched per chunk.")
+@click.option("--margin-seconds", type=int, default=MARGIN_SECONDS,
+              help="Leave rows stamped this recently for the next run.")
+@with_appcontext
+def export_snapshot_command(output_dir, file_format, full, chunk_size, margin_seconds):
+    """Export rows changed since the last snapshot to columnar files"""
+    try:
+        run_export(output_dir, file_format, full, chunk_size, margin_seconds)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+
+if __name__ == "__main__":
+    from app import app
+    with app.app_context():
+        run_export()
@@ -0,0 +1,37 @@
+import pytest
+
+from app import create_app
+from extensions import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+    })
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    client.post('/register', json={
+        'username': 'gym_rat', 'email': 'gym_rat@example.com', 'password': 'password123'
+    })
+    response = client.post('/login', json={'username': 'gym_rat', 'password': 'password123'})
+    return {'Authorization': f"Bearer {response.json['access_token']}"}
+
+
+@pytest.fixture
+def exercise_id(client, auth_headers):
+    response = client.post('/exercises', headers=auth_headers, json={'name': 'Bench Press', 'category': 'Strength'})
+    return response.json['id']
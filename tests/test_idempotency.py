@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import IdempotencyKey, Workout
+
+
+def post_workout(client, headers, key, **data):
+    body = {'type': 'Cardio', 'duration': 30, **data}
+    return client.post('/workouts', headers={**headers, 'Idempotency-Key': key}, json=body)
+
+
+def test_replayed_post_returns_stored_response(app, client, auth_headers):
+    first = post_workout(client, auth_headers, 'retry-1')
+    second = post_workout(client, auth_headers, 'retry-1')
+
+    assert first.status_code == second.status_code == 201
+    assert second.json == first.json
+    with app.app_context():
+        assert Workout.query.count() == 1
+        assert IdempotencyKey.query.count() == 1
+
+
+def test_reused_key_with_different_body_is_rejected(app, client, auth_headers):
+    assert post_workout(client, auth_headers, 'retry-2').status_code == 201
+
+    response = post_workout(client, auth_headers, 'retry-2', duration=60)
+
+    assert response.status_code == 422
+    with app.app_context():
+        assert Workout.query.count() == 1
+
+
+def test_purge_removes_expired_keys(app, client, auth_headers):
+    post_workout(client, auth_headers, 'old')
+    post_workout(client, auth_headers, 'new')
+    with app.app_context():
+        IdempotencyKey.query.filter_by(key='old').update({'created_at': db.func.datetime('now', '-2 days')})
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['purge-idempotency-keys'])
+
+    assert 'Deleted 1 expired idempotency keys.' in result.output
+    with app.app_context():
+        assert [key.key for key in IdempotencyKey.query] == ['new']
+
+
+def test_expired_key_is_not_replayed(app, client, auth_headers):
+    post_workout(client, auth_headers, 'stale')
+    with app.app_context():
+        key = IdempotencyKey.query.filter_by(key='stale').one()
+        assert abs(datetime.utcnow() - key.created_at) < timedelta(minutes=1)
+        key.created_at = datetime.utcnow() - timedelta(hours=25)
+        db.session.commit()
+
+    assert post_workout(client, auth_headers, 'stale').status_code == 201
+    with app.app_context():
+        assert Workout.query.count() == 2
@@ -0,0 +1,54 @@
+def get_record(client, headers, exercise_id):
+    response = client.get(f'/personal-records/{exercise_id}', headers=headers)
+    return response.status_code, response.json
+
+
+def test_records_follow_posts_and_deletes(client, auth_headers, exercise_id):
+    response = client.post('/workouts', headers=auth_headers, json={
+        'type': 'Strength Training', 'duration': 45,
+        'exercises': [
+            {'exercise_id': exercise_id, 'sets': 3, 'reps': 10, 'weight': 60},
+            {'exercise_id': exercise_id, 'sets': 1, 'reps': 1, 'weight': 100},
+        ]
+    })
+    assert response.status_code == 201
+    workout_id = response.json['id']
+
+    status, record = get_record(client, auth_headers, exercise_id)
+    assert status == 200
+    assert record['max_weight'] == 100
+    assert record['max_reps'] == 10
+    assert record['estimated_one_rep_max'] == 100
+    assert record['total_volume'] == 3 * 10 * 60 + 100
+    assert record['total_sets'] == 4
+    assert record['entries'] == 2
+    assert len(record['progression']) == 1
+    assert record['progression'][0]['entries'] == 2
+
+    response = client.post('/workout-exercises', headers=auth_headers, json={
+        'workout_id': workout_id, 'exercise_id': exercise_id, 'sets': 2, 'reps': 5, 'weight': 110
+    })
+    assert response.status_code == 201
+    added_id = response.json['id']
+
+    status, record = get_record(client, auth_headers, exercise_id)
+    assert record['max_weight'] == 110
+    assert record['estimated_one_rep_max'] == round(110 * (1 + 5 / 30.0), 2)
+    assert record['total_volume'] == 3 * 10 * 60 + 100 + 2 * 5 * 110
+    assert record['entries'] == 3
+    assert record['progression'][0]['total_sets'] == 6
+
+    assert client.delete(f'/workout-exercises/{added_id}', headers=auth_headers).status_code == 204
+
+    status, record = get_record(client, auth_headers, exercise_id)
+    assert record['max_weight'] == 100
+    assert record['estimated_one_rep_max'] == 100
+    assert record['entries'] == 2
+    assert record['progression'][0]['entries'] == 2
+
+    assert client.delete(f'/workouts/{workout_id}', headers=auth_headers).status_code == 204
+
+    status, _ = get_record(client, auth_headers, exercise_id)
+    assert status == 404
+    assert client.get('/personal-records', headers=auth_headers).json == []
+
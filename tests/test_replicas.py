@@ -0,0 +1,66 @@
+import shutil
+import sqlite3
+
+import pytest
+
+from app import create_app
+from extensions import db
+from replicas import STICKY_COOKIE
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{primary}",
+        'SQLALCHEMY_REPLICA_URLS': [f"sqlite:///{replica}"],
+    })
+    with app.app_context():
+        db.create_all()
+    # Schema management must only ever touch the primary.
+    assert not replica.exists()
+
+    client = app.test_client()
+    client.post('/register', json={'username': 'gym_rat', 'email': 'gym_rat@example.com', 'password': 'password123'})
+    client.post('/exercises', headers=login(client), json={'name': 'Squat', 'category': 'Strength'})
+
+    # A lagging replica: same rows, but it has not seen the latest rename yet.
+    shutil.copy(primary, replica)
+    with sqlite3.connect(primary) as conn:
+        conn.execute("UPDATE exercises SET name = 'Back Squat'")
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+    app.extensions['replicas'].dispose()
+
+
+def login(client):
+    response = client.post('/login', json={'username': 'gym_rat', 'password': 'password123'})
+    return {'Authorization': f"Bearer {response.json['access_token']}"}
+
+
+def exercise_names(client, headers=None):
+    return [exercise['name'] for exercise in client.get('/exercises', headers=headers).json]
+
+
+def test_reads_go_to_the_replica(replica_app):
+    assert exercise_names(replica_app.test_client()) == ['Squat']
+
+
+def test_reads_after_a_write_stay_on_the_primary(replica_app):
+    client = replica_app.test_client()
+    headers = login(client)
+
+    response = client.post('/exercises', headers=headers, json={'name': 'Deadlift', 'category': 'Strength'})
+    assert response.status_code == 201
+    assert STICKY_COOKIE in response.headers['Set-Cookie']
+
+    # The cookie keeps this client on the primary.
+    assert exercise_names(client) == ['Back Squat', 'Deadlift']
+
+    # Without it, anonymous reads are back on the stale replica...
+    client.delete_cookie(STICKY_COOKIE)
+    assert exercise_names(client) == ['Squat']
+    # ...while the writing user is still pinned to the primary in-process.
+    assert exercise_names(client, headers) == ['Back Squat', 'Deadlift']
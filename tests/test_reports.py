@@ -0,0 +1,144 @@
+from collections import defaultdict
+from datetime import date, timedelta
+import math
+import sqlite3
+
+import pytest
+
+from benchmarks.cohort_report import build_database
+from reports import CALORIE_BINS, DURATION_BINS, cohort_report
+
+MAX_WEEKS = 6
+
+
+@pytest.fixture(scope='module')
+def database(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('reports') / 'cohort.db')
+    build_database(path, rows=2000, users=40, exercises=5)
+    conn = sqlite3.connect(path)
+    # Rows the generator never produces: missing calories, user, date and exercise
+    # fields, and a workout type that only shows up in the last chunk of the last partition.
+    conn.executemany(
+        "INSERT INTO workouts (id, type, duration, calories_burned, date, user_id) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (2001, 'Cardio', 30, None, '2025-03-04 07:00:00', 3),
+            (2002, 'Cardio', 400, 2500, None, 4),
+            (2003, 'Yoga', 20, 80, '2025-03-05 08:00:00', None),
+            (2004, 'Rowing', 25, 300, '2025-12-30 18:00:00', 41),
+            (2005, 'Rowing', 35, None, '2026-01-02 18:00:00', 7),
+        ],
+    )
+    conn.execute("INSERT INTO users VALUES (41, 'user41', 'user41@example.com', '')")
+    conn.executemany(
+        "INSERT INTO workout_exercises VALUES (?, ?, ?, ?, ?, ?)",
+        [(2001, None, 10, 20.0, 2001, 1), (2002, 4, None, 50.0, 2004, 2), (2003, 5, 5, 60.0, 2005, 3)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def week_start(value):
+    day = date.fromisoformat(value[:10])
+    return day - timedelta(days=day.weekday())
+
+
+def summary(values, bins):
+    """Plain-Python version of reports._summary."""
+    if not values:
+        return {"count": 0, "mean": None, "std": None, "histogram": None}
+    mean = sum(values) / len(values)
+    counts = [0] * (len(bins) - 1)
+    for value in values:
+        counts[min(max(int(value // (bins[1] - bins[0])), 0), len(counts) - 1)] += 1
+    return {
+        "count": len(values),
+        "mean": mean,
+        "std": math.sqrt(sum((v - mean) ** 2 for v in values) / len(values)),
+        "histogram": {"bin_edges": bins.tolist(), "counts": counts},
+    }
+
+
+def naive_report(path):
+    conn = sqlite3.connect(path)
+    workouts = conn.execute("SELECT id, type, duration, calories_burned, date, user_id FROM workouts").fetchall()
+    workout_exercises = conn.execute("SELECT sets, reps, weight, workout_id FROM workout_exercises").fetchall()
+    conn.close()
+
+    active = defaultdict(set)
+    for _, _, _, _, when, user_id in workouts:
+        if when is not None and user_id is not None:
+            active[week_start(when)].add(user_id)
+    weeks = sorted(active)
+    last = weeks[-1]
+    wau = {week.isoformat(): len(users) for week, users in active.items()}
+
+    cohorts = defaultdict(set)
+    seen = set()
+    for week in weeks:
+        for user_id in active[week] - seen:
+            cohorts[week].add(user_id)
+        seen |= active[week]
+    retention = {}
+    for week, members in cohorts.items():
+        elapsed = min(MAX_WEEKS, (last - week).days // 7)
+        retention[week.isoformat()] = {
+            "size": len(members),
+            "retention": [
+                round(len(members & active.get(week + timedelta(weeks=k), set())) / len(members), 4)
+                for k in range(elapsed + 1)
+            ],
+        }
+
+    types = {}
+    type_of = {}
+    for workout_id, workout_type, duration, calories, _, _ in workouts:
+        type_of[workout_id] = workout_type
+        entry = types.setdefault(workout_type, {"durations": [], "calories": [], "entries": 0, "sets": 0, "volume": 0.0})
+        entry["durations"].append(duration)
+        if calories is not None:
+            entry["calories"].append(calories)
+    for sets, reps, weight, workout_id in workout_exercises:
+        entry = types[type_of[workout_id]]
+        entry["entries"] += 1
+        entry["sets"] += sets or 0
+        entry["volume"] += (sets or 0) * (reps or 0) * (weight or 0)
+
+    workout_types = {
+        name: {
+            "workouts": len(entry["durations"]),
+            "duration": summary(entry["durations"], DURATION_BINS),
+            "calories_burned": summary(entry["calories"], CALORIE_BINS),
+            "exercise_entries": entry["entries"],
+            "total_sets": entry["sets"],
+            "total_volume": entry["volume"],
+        }
+        for name, entry in types.items()
+    }
+    return {"weekly_active_users": wau, "retention": retention, "workout_types": workout_types}
+
+
+def assert_summary(actual, expected):
+    assert actual["count"] == expected["count"]
+    assert actual["histogram"] == expected["histogram"]
+    if expected["count"]:
+        assert actual["mean"] == pytest.approx(expected["mean"], abs=0.006)
+        assert actual["std"] == pytest.approx(expected["std"], abs=0.006)
+
+
+@pytest.mark.parametrize('workers, chunk_size', [(1, 100_000), (2, 97), (3, 250)])
+def test_cohort_report_matches_naive_computation(database, workers, chunk_size):
+    report = cohort_report(f"sqlite:///{database}", workers=workers, chunk_size=chunk_size, max_weeks=MAX_WEEKS)
+    expected = naive_report(database)
+
+    assert report["weekly_active_users"] == expected["weekly_active_users"]
+    assert report["retention"] == expected["retention"]
+    assert sorted(report["workout_types"]) == sorted(expected["workout_types"])
+    for name, actual in report["workout_types"].items():
+        wanted = expected["workout_types"][name]
+        assert actual["workouts"] == wanted["workouts"]
+        assert_summary(actual["duration"], wanted["duration"])
+        assert_summary(actual["calories_burned"], wanted["calories_burned"])
+        assert actual["exercise_entries"] == wanted["exercise_entries"]
+        assert actual["total_sets"] == wanted["total_sets"]
+        assert actual["total_volume"] == pytest.approx(wanted["total_volume"], abs=0.006)
@@ -0,0 +1,148 @@
+import json
+import os
+import time
+
+import pyarrow.dataset as ds
+import pytest
+
+from extensions import db
+from models import User, Workout, Exercise, WorkoutExercise
+from snapshots import MANIFEST, TABLES, export_snapshot
+
+
+@pytest.fixture
+def snapshot_app(app):
+    with app.app_context():
+        user = User(username='gym_rat', email='gym_rat@example.com')
+        user.set_password('password123')
+        squat = Exercise(name='Squat', category='Strength')
+        workout = Workout(type='Strength Training', duration=45, user=user)
+        workout.workout_exercises.append(WorkoutExercise(exercise=squat, sets=3, reps=5, weight=100))
+        db.session.add_all([user, workout])
+        db.session.commit()
+        # Everything was written well before the first export.
+        for model in (User, Exercise, Workout, WorkoutExercise):
+            stamp(model, '-2 hours')
+    return app
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    return tmp_path / 'snapshots'
+
+
+def stamp(model, offset, **filters):
+    """Move ``updated_at`` relative to the database clock, in CURRENT_TIMESTAMP format."""
+    db.session.execute(
+        db.update(model).filter_by(**filters).values(updated_at=db.func.datetime('now', offset))
+    )
+    db.session.commit()
+
+
+def export(app, output_dir, **kwargs):
+    with app.app_context():
+        return export_snapshot(str(output_dir), **kwargs)
+
+
+def read(output_dir, table, file_format='ipc'):
+    return ds.dataset(os.path.join(output_dir, table), format=file_format, partitioning='hive').to_table()
+
+
+def manifest(output_dir):
+    with open(os.path.join(output_dir, MANIFEST)) as f:
+        return json.load(f)
+
+
+def next_second():
+    # Run ids and SQLite's CURRENT_TIMESTAMP have one-second resolution.
+    time.sleep(1.1)
+
+
+def test_first_run_exports_every_row(snapshot_app, output_dir):
+    written = export(snapshot_app, output_dir, margin_seconds=0)
+
+    assert written == {'users': 1, 'exercises': 1, 'workouts': 1, 'workout_exercises': 1}
+    users = read(output_dir, 'users')
+    assert 'password_hash' not in users.column_names
+    assert users.column('username').to_pylist() == ['gym_rat']
+    assert read(output_dir, 'workout_exercises').column('weight').to_pylist() == [100.0]
+
+
+def test_unchanged_run_writes_nothing_and_advances(snapshot_app, output_dir):
+    export(snapshot_app, output_dir, margin_seconds=0)
+    first = manifest(output_dir)['watermark']
+    next_second()
+
+    written = export(snapshot_app, output_dir, margin_seconds=0)
+
+    assert written == dict.fromkeys(TABLES, 0)
+    assert manifest(output_dir)['watermark'] > first
+    assert len(manifest(output_dir)['runs']) == 2
+
+
+def test_changed_row_is_exported_again(snapshot_app, output_dir):
+    export(snapshot_app, output_dir, margin_seconds=0)
+    next_second()
+    with snapshot_app.app_context():
+        Workout.query.one().notes = 'Felt strong'
+        db.session.commit()
+        stamp(Workout, '-1 seconds')
+    next_second()
+
+    written = export(snapshot_app, output_dir, margin_seconds=0)
+
+    assert written['workouts'] == 1
+    assert written['users'] == written['exercises'] == written['workout_exercises'] == 0
+    workouts = read(output_dir, 'workouts')
+    assert set(workouts.column('notes').to_pylist()) == {None, 'Felt strong'}
+    run_ids = [run['id'] for run in manifest(output_dir)['runs']]
+    parts = sorted(os.path.basename(f) for f in ds.dataset(os.path.join(output_dir, 'workouts'), format='ipc').files)
+    assert parts == [f'part-{run_id}-0.arrow' for run_id in run_ids]
+
+
+def test_rows_inside_the_margin_wait_for_the_next_run(snapshot_app, output_dir):
+    with snapshot_app.app_context():
+        stamp(Exercise, '-10 seconds')
+
+    written = export(snapshot_app, output_dir, margin_seconds=300)
+    assert written['exercises'] == 0
+    assert written['users'] == 1
+
+    next_second()
+    written = export(snapshot_app, output_dir, margin_seconds=0)
+    assert written['exercises'] == 1
+    assert written['users'] == 0
+
+
+def test_switching_format_needs_full(snapshot_app, output_dir):
+    export(snapshot_app, output_dir, margin_seconds=0)
+
+    with pytest.raises(ValueError, match='--full'):
+        export(snapshot_app, output_dir, file_format='parquet', margin_seconds=0)
+
+    next_second()
+    written = export(snapshot_app, output_dir, file_format='parquet', full=True, margin_seconds=0)
+    assert written['users'] == 1
+    assert read(output_dir, 'users', 'parquet').num_rows == 1
+
+
+def test_full_only_removes_snapshot_files(snapshot_app, output_dir):
+    export(snapshot_app, output_dir, margin_seconds=0)
+    table_dirs = [os.path.join(output_dir, table) for table in TABLES]
+    first_parts = [f for path in table_dirs for f in ds.dataset(path, format='ipc').files]
+    stale = [os.path.join(output_dir, table, 'day=unknown', 'stale.arrow') for table in TABLES]
+    for path in stale:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'w').close()
+    (output_dir / 'notes.txt').write_text('keep me')
+    (output_dir / 'other').mkdir()
+    (output_dir / 'other' / 'data.arrow').write_text('keep me too')
+    next_second()
+
+    written = export(snapshot_app, output_dir, full=True, margin_seconds=0)
+
+    assert written == dict.fromkeys(TABLES, 1)
+    assert not any(os.path.exists(path) for path in stale + first_parts)
+    assert len(manifest(output_dir)['runs']) == 1
+    assert (output_dir / 'notes.txt').read_text() == 'keep me'
+    assert (output_dir / 'other' / 'data.arrow').read_text() == 'keep me too'
@@ -0,0 +1,55 @@
+import sys
+
+from sqlalchemy import text
+
+from app import create_app, dispose_engines, LazyCommand
+from benchmarks.startup import sample
+from extensions import db
+
+# Generous budgets: this guards against regressions like eager NumPy/Alembic
+# imports, not against slow CI machines.
+MAX_IMPORT_MS = 5000
+MAX_FIRST_REQUEST_MS = 2000
+
+
+def test_serving_process_stays_lean(tmp_path):
+    result = sample(tmp_path / 'startup.db')
+
+    assert result['cli_modules'] == [], f"CLI-only modules imported: {result['cli_modules']}"
+    assert result['import_ms'] < MAX_IMPORT_MS
+    assert result['first_request_ms'] < MAX_FIRST_REQUEST_MS
+
+
+def test_cli_commands_load_on_invoke(app):
+    command = app.cli.commands['db']
+    assert isinstance(command, LazyCommand)
+    assert command._command is None
+    assert 'flask_migrate' not in sys.modules
+
+    result = app.test_cli_runner().invoke(args=['db', '--help'])
+
+    assert result.exit_code == 0
+    assert 'upgrade' in result.output
+    assert command._command is not None
+    assert 'flask_migrate' in sys.modules
+
+
+def test_dispose_engines_resets_every_pool(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'SQLALCHEMY_REPLICA_URLS': [f"sqlite:///{tmp_path / 'replica.db'}"],
+    })
+    with app.app_context():
+        engines = list(db.engines.values()) + list(app.extensions['replicas'].engines.values())
+    for engine in engines:
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+    pools = [engine.pool for engine in engines]
+    assert all(pool.checkedin() == 1 for pool in pools)
+
+    dispose_engines(app)
+
+    for engine, pool in zip(engines, pools):
+        assert engine.pool is not pool
+        assert engine.pool.checkedin() == 0
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+
+
+def test_exercise_ids_are_coerced(client, auth_headers, exercise_id):
+    response = client.post('/workouts', headers=auth_headers, json={
+        'type': 'Strength Training', 'duration': 30,
+        'exercises': [{'exercise_id': str(exercise_id), 'sets': 3, 'reps': 5, 'weight': 80}]
+    })
+    assert response.status_code == 201
+    assert response.json['exercises'][0]['exercise_id'] == exercise_id
+
+
+@pytest.mark.parametrize('bad_id', [[1], {'id': 1}, 'bench'])
+def test_invalid_exercise_ids_are_rejected(client, auth_headers, bad_id):
+    response = client.post('/workouts', headers=auth_headers, json={
+        'type': 'Strength Training', 'duration': 30, 'exercises': [{'exercise_id': bad_id}]
+    })
+    assert response.status_code == 400
+    assert client.get('/workouts', headers=auth_headers).json == []
+
+
+def test_nested_exercises_are_loaded_once(app, client, auth_headers):
+    ids = [
+        client.post('/exercises', headers=auth_headers, json={'name': f'Exercise {i}'}).json['id']
+        for i in range(8)
+    ]
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        response = client.post('/workouts', headers=auth_headers, json={
+            'type': 'Strength Training', 'duration': 60,
+            'exercises': [{'exercise_id': i, 'sets': 3, 'reps': 5, 'weight': 50} for i in ids]
+        })
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert response.status_code == 201
+    assert [e['exercise']['id'] for e in response.json['exercises']] == ids
+    assert len([s for s in statements if s.lstrip().startswith('SELECT') and 'FROM exercises' in s]) == 1